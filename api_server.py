@@ -0,0 +1,479 @@
+"""FastAPI service exposing the fraud detector.
+
+Single-transaction requests are coalesced by a background batcher: each
+request parks its payload on an asyncio queue and awaits a future, while
+one consumer drains the queue into a frame, runs feature engineering and
+detection once per batch, and resolves the futures. One model call on an
+N-row batch is far cheaper than N single-row calls.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+
+from src.config import (
+    API_HOST,
+    API_PORT,
+    FEATURE_ENGINEER_PATH,
+    FRAUD_MODEL_INT8_ONNX_PATH,
+    FRAUD_MODEL_ONNX_PATH,
+)
+from src.fraud_detector import FraudDetector, _decode_rule_mask, _score_rules
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="Transaction Fraud Detection API",
+    version="1.0",
+    # orjson serializes numpy-friendly result dicts several times faster
+    # than the default json encoder.
+    default_response_class=ORJSONResponse,
+)
+
+# Batching knobs: wait at most MAX_BATCH_DELAY seconds to fill a batch of
+# up to MAX_BATCH_SIZE queued requests.
+MAX_BATCH_SIZE = 32
+MAX_BATCH_DELAY = 0.01
+
+fraud_detector: Optional[FraudDetector] = None
+feature_engineer = None
+_featurize_single = None
+
+# Running sums keep /metrics O(1); the bounded deque holds only the most
+# recent latencies for on-demand percentiles, so memory is fixed no
+# matter how long the server runs.
+metrics = {
+    "requests_total": 0,
+    "frauds_detected": 0,
+    "latency_sum_ms": 0.0,
+    "recent_latencies_ms": deque(maxlen=4096),
+}
+
+
+def _record_request(count, frauds, latency_ms):
+    metrics["requests_total"] += count
+    metrics["frauds_detected"] += frauds
+    metrics["latency_sum_ms"] += latency_ms
+    metrics["recent_latencies_ms"].append(latency_ms)
+
+
+class Transaction(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+        json_schema_extra={
+            "example": {
+                "Transaction_Date": "2024-06-15",
+                "Transaction_Time": "14:30:00",
+                "Transaction_Amount": 2500.0,
+                "Transaction_Velocity": 2,
+                "Distance_From_Home_km": 12.5,
+                "Time_Since_Last_Transaction_min": 95.0,
+                "Account_Age_Days": 730,
+                "Previous_Auth_Failure": 0,
+                "Card_Present": 1,
+                "Card_Type": "Visa",
+                "Currency": "INR",
+                "Transaction_Location": "Mumbai",
+                "Merchant_Category": "Groceries",
+            }
+        },
+    )
+
+    Transaction_Date: str
+    Transaction_Time: str
+    Transaction_Amount: float
+    Transaction_Velocity: int
+    Distance_From_Home_km: float
+    Time_Since_Last_Transaction_min: float
+    Account_Age_Days: int
+    Previous_Auth_Failure: int = 0
+    Card_Present: int = 1
+    Card_Type: str
+    Currency: str
+    Transaction_Location: str
+    Merchant_Category: str
+
+
+class TransactionBatch(BaseModel):
+    transactions: List[Transaction]
+
+
+def _make_single_featurizer():
+    """Bind a pandas-free single-row featurizer to the fitted engineer.
+
+    Delegates to ``FeatureEngineer.compile_single_row_fn``, which
+    specializes the engineering chain as scalar arithmetic into one
+    preallocated float32 buffer ordered by the model's training columns.
+    Buffer reuse is safe here because only the (single) batch-worker task
+    invokes it. Returns None when the model does not expose its column
+    schema, in which case the frame path stays in use.
+    """
+    names = getattr(fraud_detector, "_feature_names", None)
+    if feature_engineer is None or not names:
+        return None
+    return feature_engineer.compile_single_row_fn(names, reuse_buffer=True)
+
+
+@lru_cache(maxsize=4096)
+def _featurize_cached(tx_items):
+    """Engineered features for one frozen transaction payload.
+
+    Keyed on the sorted ``(field, value)`` tuple of the raw payload; every
+    derived feature is a deterministic function of those fields, so
+    exact-duplicate requests (retries, replayed batches) skip the whole
+    featurization pass. The shared featurizer buffer is copied out because
+    cached entries must outlive the next call.
+    """
+    values, vec = _featurize_single(dict(tx_items))
+    return values, vec.copy()
+
+
+@lru_cache(maxsize=4096)
+def _ml_score_cached(vec_bytes, n_features):
+    """Model probability for one frozen feature vector.
+
+    Cached separately from the features and keyed on the vector bytes, so
+    the rule score — which the caller recomputes every request — never
+    goes through this cache. Both caches are size-bounded and cleared on
+    startup when a (possibly different) model is loaded.
+    """
+    vec = np.frombuffer(vec_bytes, dtype=np.float32).reshape(1, n_features)
+    return float(fraud_detector._predict_fn(vec)[0, 1])
+
+
+def _detect_single_fast(tx):
+    """Score one transaction without touching pandas."""
+    values, vec = _featurize_cached(tuple(sorted(tx.items())))
+    if fraud_detector._model_loaded:
+        ml_score = _ml_score_cached(vec.tobytes(), len(vec))
+    else:
+        ml_score = 0.0
+    # Call the jitted kernel directly with the scalars already in hand —
+    # no dict.get chain between the request and the compiled code.
+    rule_score, rule_mask = _score_rules(
+        float(values["Transaction_Amount"]),
+        float(values["Transaction_Velocity"]),
+        float(values["Distance_From_Home_km"]),
+        float(values["Time_Since_Last_Transaction_min"]),
+        float(values["Hour"]),
+        bool(values["Is_Weekend"]),
+        bool(values["Previous_Auth_Failure"]),
+        fraud_detector._rule_thresholds,
+    )
+    triggered = _decode_rule_mask(int(rule_mask))
+    combined = 0.7 * ml_score + 0.3 * rule_score
+    return {
+        "ml_risk_score": ml_score,
+        "rule_risk_score": rule_score,
+        "combined_risk_score": combined,
+        "risk_level": fraud_detector._get_risk_level(combined),
+        "is_fraud": combined >= 0.5,
+        "triggered_rules": triggered,
+        "recommendation": fraud_detector._get_recommendation(combined),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+# Batches at or above this row count fan prediction out to a process
+# pool; smaller ones are not worth the shared-memory round trip.
+MP_MIN_ROWS = 20_000
+_mp_pool = None
+_mp_detector = None
+
+
+def _serving_model_path():
+    """Pick the fastest available model artifact.
+
+    Training only writes the int8 ONNX file when its validation AUC stays
+    within tolerance of FP32, so its mere presence means it passed the
+    accuracy check; it is preferred, then the FP32 ONNX graph, then the
+    joblib pickle (signalled by ``None`` for the detector's default path).
+    """
+    if FRAUD_MODEL_INT8_ONNX_PATH.exists():
+        return FRAUD_MODEL_INT8_ONNX_PATH
+    if FRAUD_MODEL_ONNX_PATH.exists():
+        return FRAUD_MODEL_ONNX_PATH
+    return None
+
+
+def _mp_worker_init():
+    """Load a model replica in each prediction worker process."""
+    global _mp_detector
+    _mp_detector = FraudDetector()
+    model_path = _serving_model_path()
+    if model_path is not None:
+        _mp_detector.load_model(model_path)
+    else:
+        _mp_detector.load_model()
+
+
+def _mp_predict_chunk(shm_name, shape, start, end):
+    """Predict one row slice of the shared feature matrix."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        X = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        return _mp_detector._predict_fn(X[start:end])[:, 1].copy()
+    finally:
+        shm.close()
+
+
+def _predict_proba_shared(X):
+    """Fan predict_proba out across worker processes via shared memory.
+
+    The feature matrix is written once into a SharedMemory block, so
+    workers attach zero-copy views of their row slices instead of
+    pickling sub-matrices through the pool's pipes.
+    """
+    global _mp_pool
+    if _mp_pool is None:
+        _mp_pool = ProcessPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 2) // 2), initializer=_mp_worker_init
+        )
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    shm = shared_memory.SharedMemory(create=True, size=X.nbytes)
+    try:
+        np.ndarray(X.shape, dtype=np.float32, buffer=shm.buf)[:] = X
+        n = X.shape[0]
+        chunk = -(-n // _mp_pool._max_workers)
+        futures = [
+            _mp_pool.submit(_mp_predict_chunk, shm.name, X.shape, start, min(start + chunk, n))
+            for start in range(0, n, chunk)
+        ]
+        return np.concatenate([f.result() for f in futures])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Template frame for single-row fallbacks: built once with settled
+# dtypes so per-request construction is an overwrite, not dtype
+# inference plus a fresh BlockManager.
+_template_df = None
+_template_col_idx = None
+
+
+def _frame_from_single(tx):
+    df = _template_df.copy()
+    col_idx = _template_col_idx
+    for key, value in tx.items():
+        df.iat[0, col_idx[key]] = value
+    return df
+
+
+def _infer_frame_sync(payloads):
+    """Blocking frame-path inference: one engineered frame, one batch call."""
+    if len(payloads) == 1 and _template_df is not None:
+        df = _frame_from_single(payloads[0])
+    else:
+        df = pd.DataFrame(payloads)
+    # Without a fitted engineer the raw frame still scores through the
+    # rule engine, which defaults any missing engineered column.
+    if feature_engineer is not None:
+        features = feature_engineer.engineer_all_features(df, fit=False)
+    else:
+        features = df
+    if len(features) >= MP_MIN_ROWS and fraud_detector._model_loaded:
+        model_input = (
+            features[fraud_detector._feature_names]
+            if fraud_detector._feature_names is not None
+            else features
+        )
+        ml_scores = _predict_proba_shared(model_input.to_numpy())
+        return fraud_detector.batch_detect(features, ml_scores=ml_scores)
+    return fraud_detector.batch_detect(features)
+
+
+async def _batch_worker(queue):
+    """Drain queued (payload, future) pairs into batched detection.
+
+    The blocking inference itself runs on the app executor so health and
+    metrics endpoints stay responsive while a batch is being scored.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await queue.get()
+        pending = [item]
+        deadline = loop.time() + MAX_BATCH_DELAY
+        while len(pending) < MAX_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            if len(pending) == 1 and _featurize_single is not None:
+                payload, future = pending[0]
+                result = await loop.run_in_executor(
+                    app.state.executor, _detect_single_fast, payload
+                )
+                if not future.done():
+                    future.set_result(result)
+                continue
+            results = await loop.run_in_executor(
+                app.state.executor, _infer_frame_sync, [payload for payload, _ in pending]
+            )
+            for (_, future), result in zip(pending, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as exc:  # pragma: no cover - propagate to callers
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+
+
+def _warmup():
+    """Run both inference paths once so the first request pays nothing.
+
+    The dummy pass forces sklearn's lazy imports, faults the mmap'd model
+    pages in, and exercises the jitted kernels so no compile or cold-IO
+    cost lands on the first real transaction.
+    """
+    example = Transaction.model_config["json_schema_extra"]["example"]
+    try:
+        df = pd.DataFrame([example])
+        if feature_engineer is not None:
+            df = feature_engineer.engineer_all_features(df, fit=False)
+        fraud_detector.batch_detect(df)
+        if _featurize_single is not None:
+            _detect_single_fast(dict(example))
+        logger.info("Warmup inference complete")
+    except Exception as exc:  # pragma: no cover - warmup is best-effort
+        logger.warning("Warmup inference failed: %s", exc)
+
+
+@app.on_event("startup")
+async def startup_event():
+    global fraud_detector, feature_engineer, _featurize_single
+    fraud_detector = FraudDetector()
+    # Both loaders mmap the pickled arrays read-only, so when uvicorn
+    # forks multiple workers they all share one page-cache copy of the
+    # model instead of unpickling it into every process heap. ONNX
+    # artifacts, when exported by training, are preferred (int8 first):
+    # ORT's compiled graph executor beats sklearn dispatch on both single
+    # rows and batches.
+    # A fresh checkout has no trained artifacts yet; boot anyway and
+    # degrade to rule-based scoring, the same way the Streamlit apps do.
+    model_path = _serving_model_path()
+    try:
+        if model_path is not None:
+            fraud_detector.load_model(model_path)
+        else:
+            fraud_detector.load_model()
+    except FileNotFoundError:
+        logger.warning("No trained model found — serving rule-based scores only")
+    try:
+        fraud_detector.load_feature_engineer()
+    except FileNotFoundError:
+        logger.warning(
+            "Feature engineer missing at %s — run preprocessing to enable ML scoring",
+            FEATURE_ENGINEER_PATH,
+        )
+    feature_engineer = fraud_detector.feature_engineer
+    _featurize_single = _make_single_featurizer()
+    # Cached vectors/scores belong to the previous model/engineer pair.
+    _featurize_cached.cache_clear()
+    _ml_score_cached.cache_clear()
+    global _template_df, _template_col_idx
+    _template_df = pd.DataFrame([Transaction.model_config["json_schema_extra"]["example"]])
+    _template_col_idx = {col: i for i, col in enumerate(_template_df.columns)}
+    _warmup()
+    app.state.executor = ThreadPoolExecutor(max_workers=4)
+    app.state.model_queue = asyncio.Queue()
+    app.state.batch_task = asyncio.create_task(_batch_worker(app.state.model_queue))
+    logger.info("Fraud detection service ready")
+
+
+@app.get("/health")
+async def health():
+    # model_loaded distinguishes a fully armed instance from one that
+    # booted without artifacts and serves rule-based scores only.
+    return ORJSONResponse(
+        {
+            "status": "ok",
+            "model_loaded": fraud_detector is not None and fraud_detector._model_loaded,
+        }
+    )
+
+
+@app.post("/detect/fraud")
+async def detect_fraud(transaction: Transaction):
+    """Score one transaction through the shared batcher."""
+    start = time.perf_counter_ns()
+    future = asyncio.get_running_loop().create_future()
+    await app.state.model_queue.put((transaction.model_dump(), future))
+    result = await future
+    _record_request(1, int(result["is_fraud"]), (time.perf_counter_ns() - start) / 1e6)
+    # Returning a Response directly skips FastAPI's jsonable_encoder walk
+    # over the result dict; orjson handles numpy scalars natively.
+    return ORJSONResponse(result)
+
+
+@app.post("/detect/batch")
+async def batch_detect_fraud(batch: TransactionBatch):
+    """Score a client-supplied batch of transactions in one pass.
+
+    One DataFrame covers the whole batch, so feature engineering and the
+    model call run once instead of once per row.
+    """
+    start = time.perf_counter_ns()
+    # pydantic v2 stores validated values directly on __dict__, so this
+    # skips a model_dump reflection pass per row.
+    rows = [transaction.__dict__ for transaction in batch.transactions]
+    results = await asyncio.get_running_loop().run_in_executor(
+        app.state.executor, _infer_frame_sync, rows
+    )
+    _record_request(
+        len(results), sum(r["is_fraud"] for r in results), (time.perf_counter_ns() - start) / 1e6
+    )
+    return ORJSONResponse(
+        {
+            "results": results,
+            "statistics": fraud_detector.get_fraud_statistics(results),
+        }
+    )
+
+
+@app.get("/metrics")
+async def get_metrics():
+    total = metrics["requests_total"]
+    recent = metrics["recent_latencies_ms"]
+    return ORJSONResponse(
+        {
+            "requests_total": total,
+            "frauds_detected": metrics["frauds_detected"],
+            "avg_latency_ms": metrics["latency_sum_ms"] / total if total else 0.0,
+            "p95_latency_ms": float(np.percentile(recent, 95)) if recent else 0.0,
+        }
+    )
+
+
+if __name__ == "__main__":
+    # One worker process per core (minus one for the OS), with uvloop and
+    # httptools moving the event loop and HTTP parsing into C. Each worker
+    # loads its own model in startup_event; note that the metrics dict is
+    # therefore per-worker.
+    uvicorn.run(
+        "api_server:app",
+        host=API_HOST,
+        port=API_PORT,
+        workers=max(2, (os.cpu_count() or 2) - 1),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
@@ -0,0 +1 @@
+"""Predictive transaction intelligence for BFSI — core package."""
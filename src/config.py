@@ -0,0 +1,82 @@
+"""Central configuration for the transaction intelligence pipeline."""
+
+import os
+from pathlib import Path
+
+# Inputs are validated once at preprocessing time, so skip sklearn's
+# per-predict NaN/Inf full-pass check. Must be set before sklearn is
+# imported; config is imported first by every entry point.
+os.environ.setdefault("SKLEARN_ASSUME_FINITE", "1")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+RAW_DATA_FILE = DATA_DIR / "raw" / "transactions.csv"
+PROCESSED_DATA_DIR = DATA_DIR / "processed"
+MODELS_DIR = BASE_DIR / "models"
+
+TRAIN_DATA_FILE = PROCESSED_DATA_DIR / "train_data.csv"
+VAL_DATA_FILE = PROCESSED_DATA_DIR / "val_data.csv"
+TEST_DATA_FILE = PROCESSED_DATA_DIR / "test_data.csv"
+
+# Parquet counterparts, produced by the streaming preprocessing path and
+# preferred by loaders when present.
+TRAIN_DATA_PARQUET = TRAIN_DATA_FILE.with_suffix(".parquet")
+VAL_DATA_PARQUET = VAL_DATA_FILE.with_suffix(".parquet")
+TEST_DATA_PARQUET = TEST_DATA_FILE.with_suffix(".parquet")
+
+FRAUD_MODEL_PATH = MODELS_DIR / "fraud_model.pkl"
+FRAUD_MODEL_ONNX_PATH = MODELS_DIR / "fraud_model.onnx"
+FRAUD_MODEL_INT8_ONNX_PATH = MODELS_DIR / "fraud_model.int8.onnx"
+FEATURE_ENGINEER_PATH = MODELS_DIR / "feature_engineer.pkl"
+# Training column order for serving artifacts (boosters and ONNX graphs
+# don't carry sklearn's feature_names_in_).
+FRAUD_MODEL_FEATURES_PATH = MODELS_DIR / "fraud_model.features.json"
+
+# ---------------------------------------------------------------------------
+# Reproducibility / splitting
+# ---------------------------------------------------------------------------
+RANDOM_SEED = 42
+TEST_SIZE = 0.15
+VAL_SIZE = 0.15
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+TARGET_COLUMN = "Is_Fraud"
+
+NUMERIC_COLUMNS = [
+    "Transaction_Amount",
+    "Transaction_Velocity",
+    "Distance_From_Home_km",
+    "Time_Since_Last_Transaction_min",
+    "Account_Age_Days",
+]
+
+CATEGORICAL_COLUMNS = [
+    "Card_Type",
+    "Currency",
+    "Transaction_Location",
+    "Merchant_Category",
+]
+
+# ---------------------------------------------------------------------------
+# Risk-rule thresholds (used by the fraud detector and risk indicators)
+# ---------------------------------------------------------------------------
+HIGH_AMOUNT_THRESHOLD = 100_000.0
+HIGH_VELOCITY_THRESHOLD = 5
+LONG_DISTANCE_THRESHOLD_KM = 500.0
+RAPID_SUCCESSION_MINUTES = 5.0
+NIGHT_HOUR_START = 23
+NIGHT_HOUR_END = 5
+
+# ---------------------------------------------------------------------------
+# Serving
+# ---------------------------------------------------------------------------
+API_HOST = "0.0.0.0"
+API_PORT = 8000
+
+# I/O chunking for artifact writes (rows per chunk / row group)
+SAVE_CHUNK_ROWS = 100_000
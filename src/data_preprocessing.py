@@ -0,0 +1,692 @@
+"""Data loading, feature engineering and preprocessing for BFSI transactions.
+
+The pipeline runs in three stages:
+
+1. ``TransactionDataLoader`` reads and sanitises the raw transaction CSV.
+2. ``FeatureEngineer`` derives time, amount, aggregate and risk features.
+3. ``DataPreprocessor`` encodes, splits and persists the train/val/test sets.
+"""
+
+import logging
+from datetime import date
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from joblib import Parallel, delayed
+from sklearn.model_selection import train_test_split
+
+try:
+    import polars as pl
+except ImportError:  # optional acceleration; the pandas path remains complete
+    pl = None
+try:
+    from numba import njit, prange
+except ImportError:  # optional acceleration; the numpy path remains complete
+    njit = None
+    prange = range
+
+from src.config import (
+    CATEGORICAL_COLUMNS,
+    FEATURE_ENGINEER_PATH,
+    HIGH_AMOUNT_THRESHOLD,
+    HIGH_VELOCITY_THRESHOLD,
+    LONG_DISTANCE_THRESHOLD_KM,
+    MODELS_DIR,
+    NIGHT_HOUR_END,
+    NIGHT_HOUR_START,
+    PROCESSED_DATA_DIR,
+    RANDOM_SEED,
+    RAPID_SUCCESSION_MINUTES,
+    RAW_DATA_FILE,
+    SAVE_CHUNK_ROWS,
+    TARGET_COLUMN,
+    TEST_DATA_FILE,
+    TEST_DATA_PARQUET,
+    TEST_SIZE,
+    TRAIN_DATA_FILE,
+    TRAIN_DATA_PARQUET,
+    VAL_DATA_FILE,
+    VAL_DATA_PARQUET,
+    VAL_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Right-closed bin edges for Time_Gap_Category: (0,5], (5,30], (30,60],
+# (60,1440], (1440,inf) -> codes 0..4. Binary search replaces pd.cut's
+# Interval/Categorical machinery with one vectorized pass.
+_GAP_EDGES = np.array([5.0, 30.0, 60.0, 1440.0], dtype=np.float64)
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _aggregate_kernel(amounts, velocities, distances, mean_amt, std_amt, vel_thr, dist_thr):
+        """Fused z-score + threshold-flag pass over the three numeric columns.
+
+        The separate vectorized expressions walk memory once each and
+        allocate a temporary per operation; this loop computes all three
+        outputs in a single parallel pass that LLVM vectorizes.
+        """
+        n = amounts.shape[0]
+        zscores = np.empty(n, dtype=np.float64)
+        high_vel = np.empty(n, dtype=np.int8)
+        long_dist = np.empty(n, dtype=np.int8)
+        inv_std = 1.0 / std_amt
+        for i in prange(n):
+            zscores[i] = (amounts[i] - mean_amt) * inv_std
+            high_vel[i] = np.int8(velocities[i] > vel_thr)
+            long_dist[i] = np.int8(distances[i] > dist_thr)
+        return zscores, high_vel, long_dist
+
+else:
+    _aggregate_kernel = None
+
+
+class TransactionDataLoader:
+    """Loads raw transaction data and applies basic sanity cleaning."""
+
+    def __init__(self, data_path=RAW_DATA_FILE):
+        self.data_path = data_path
+
+    def load(self):
+        """Read the raw CSV and drop obviously unusable rows.
+
+        Returns:
+            pd.DataFrame: cleaned raw transactions.
+        """
+        logger.info("Loading raw data from %s", self.data_path)
+        df = pd.read_csv(self.data_path)
+        df = df.drop_duplicates()
+        df = df.dropna(subset=[TARGET_COLUMN])
+        df[TARGET_COLUMN] = df[TARGET_COLUMN].astype(int)
+        logger.info("Loaded %d transactions", len(df))
+        return df
+
+    def scan(self):
+        """Lazily scan the raw CSV as a Polars ``LazyFrame`` with the same
+        cleaning as :meth:`load`. Requires polars."""
+        lf = pl.scan_csv(str(self.data_path))
+        return (
+            lf.unique()
+            .drop_nulls(subset=[TARGET_COLUMN])
+            .with_columns(pl.col(TARGET_COLUMN).cast(pl.Int64))
+        )
+
+
+class FeatureEngineer:
+    """Derives model features from raw transaction columns.
+
+    All methods accept and return a ``pd.DataFrame``; ``engineer_all_features``
+    chains them in the order the model expects.
+    """
+
+    def __init__(self):
+        self.category_maps = {}
+        # Fixed category indexes backing the Categorical fast path in
+        # encode_categoricals; aligned with category_maps code order.
+        self.categories_ = {}
+        self.amount_mean = None
+        self.amount_std = None
+        self.fitted = False
+        # Polars expression plan compiled against the training schema; lets
+        # inference skip all the per-column `if col in df` re-dispatch.
+        self._compiled_plan = None
+
+    def _time_columns(self, df):
+        """New time-derived columns for ``df``, as a name -> values dict."""
+        cols = {}
+        parsed = None
+        if "Transaction_Timestamp" in df.columns:
+            # Native timestamps skip string formatting and re-parsing
+            # entirely; to_datetime is a no-op passthrough for a column
+            # that is already datetime64.
+            parsed = pd.to_datetime(df["Transaction_Timestamp"], errors="coerce")
+        elif "Transaction_Date" in df.columns and "Transaction_Time" in df.columns:
+            # The explicit format keeps pandas on its C fast path instead
+            # of falling back to per-element dateutil inference; cache=True
+            # parses each distinct timestamp string once.
+            parsed = pd.to_datetime(
+                df["Transaction_Date"].astype(str) + " " + df["Transaction_Time"].astype(str),
+                format="%Y-%m-%d %H:%M:%S",
+                errors="coerce",
+                cache=True,
+            )
+        if parsed is not None:
+            # int8 is plenty for hour/weekday codes and an eighth of the
+            # memory traffic of the default int64 columns.
+            hour = parsed.dt.hour.to_numpy()
+            dow = parsed.dt.dayofweek.to_numpy()
+            cols["Hour"] = hour.astype(np.int8)
+            cols["Day_of_Week"] = dow.astype(np.int8)
+            cols["Is_Weekend"] = (dow >= 5).astype(np.int8)
+            cols["Is_Night"] = ((hour >= NIGHT_HOUR_START) | (hour <= NIGHT_HOUR_END)).astype(
+                np.int8
+            )
+        return cols
+
+    def extract_time_features(self, df):
+        """Parse ``Transaction_Date``/``Transaction_Time`` into model features."""
+        return df.assign(**self._time_columns(df))
+
+    def create_amount_features(self, df):
+        """Log-scale and flag transaction amounts."""
+        if "Transaction_Amount" in df.columns:
+            # Raw ndarray arithmetic skips Series alignment/dispatch, which
+            # dominates when the batch endpoint calls this with tiny frames.
+            amounts = df["Transaction_Amount"].to_numpy(dtype=np.float64)
+            df["Log_Amount"] = np.log1p(amounts)
+            df["High_Amount"] = (amounts > HIGH_AMOUNT_THRESHOLD).astype(int)
+        return df
+
+    def create_aggregated_features(self, df, fit=False):
+        """Z-scores, velocity/distance flags and the time-gap category.
+
+        With numba present and all three numeric columns in the frame,
+        the z-score and both threshold flags come from one fused
+        parallel kernel pass; otherwise each falls back to its own
+        vectorized numpy expression.
+        """
+        amounts = None
+        if "Transaction_Amount" in df.columns:
+            amounts = df["Transaction_Amount"].to_numpy(dtype=np.float64)
+            if fit or self.amount_mean is None:
+                self.amount_mean = float(amounts.mean())
+                self.amount_std = float(amounts.std(ddof=1)) or 1.0
+        if (
+            _aggregate_kernel is not None
+            and amounts is not None
+            and "Transaction_Velocity" in df.columns
+            and "Distance_From_Home_km" in df.columns
+        ):
+            zscores, high_vel, long_dist = _aggregate_kernel(
+                amounts,
+                df["Transaction_Velocity"].to_numpy(dtype=np.float64),
+                df["Distance_From_Home_km"].to_numpy(dtype=np.float64),
+                self.amount_mean,
+                self.amount_std,
+                float(HIGH_VELOCITY_THRESHOLD),
+                float(LONG_DISTANCE_THRESHOLD_KM),
+            )
+            df["Amount_Zscore"] = zscores
+            df["High_Velocity"] = high_vel
+            df["Long_Distance"] = long_dist
+        else:
+            if amounts is not None:
+                df["Amount_Zscore"] = (amounts - self.amount_mean) / self.amount_std
+            if "Transaction_Velocity" in df.columns:
+                df["High_Velocity"] = (
+                    df["Transaction_Velocity"].to_numpy() > HIGH_VELOCITY_THRESHOLD
+                ).astype(int)
+            if "Distance_From_Home_km" in df.columns:
+                df["Long_Distance"] = (
+                    df["Distance_From_Home_km"].to_numpy() > LONG_DISTANCE_THRESHOLD_KM
+                ).astype(int)
+        if "Time_Since_Last_Transaction_min" in df.columns:
+            gaps = df["Time_Since_Last_Transaction_min"].to_numpy(dtype=np.float64)
+            df["Time_Gap_Category"] = np.searchsorted(_GAP_EDGES, gaps, side="left").astype(np.int8)
+        return df
+
+    def _interaction_columns(self, df):
+        """Cross-term columns between amount, distance and velocity."""
+        cols = {}
+        if "Transaction_Amount" in df.columns:
+            amounts = df["Transaction_Amount"].to_numpy(dtype=np.float64)
+            if "Distance_From_Home_km" in df.columns:
+                cols["Amount_x_Distance"] = amounts * df["Distance_From_Home_km"].to_numpy()
+            if "Transaction_Velocity" in df.columns:
+                cols["Velocity_x_Amount"] = df["Transaction_Velocity"].to_numpy() * amounts
+        return cols
+
+    def create_interaction_features(self, df):
+        """Cross-terms between amount, distance and velocity."""
+        return df.assign(**self._interaction_columns(df))
+
+    def _risk_columns(self, df):
+        """Binary risk-indicator columns mirroring the rule thresholds."""
+        cols = {}
+        if "Time_Since_Last_Transaction_min" in df.columns:
+            cols["Rapid_Succession"] = (
+                df["Time_Since_Last_Transaction_min"] < RAPID_SUCCESSION_MINUTES
+            ).astype(int)
+        if "Previous_Auth_Failure" in df.columns:
+            cols["Auth_Risk"] = df["Previous_Auth_Failure"].astype(int)
+        if "Card_Present" in df.columns:
+            cols["Card_Not_Present"] = (1 - df["Card_Present"].astype(int)).astype(int)
+        return cols
+
+    def create_risk_indicators(self, df):
+        """Binary indicators mirroring the rule engine's thresholds."""
+        return df.assign(**self._risk_columns(df))
+
+    def encode_categoricals(self, df, fit=False):
+        """Integer-encode categorical columns; unseen categories map to -1.
+
+        Encoding goes through ``pd.Categorical`` with the category index
+        fixed at fit time, so the transform is a C-level factorize rather
+        than a Python-dict ``.map`` over an object column; unseen values
+        come back as code -1 for free.
+        """
+        categories_ = getattr(self, "categories_", None)
+        if categories_ is None:
+            categories_ = self.categories_ = {}
+        for col in CATEGORICAL_COLUMNS:
+            if col not in df.columns:
+                continue
+            if fit or col not in self.category_maps:
+                categories = pd.Index(sorted(df[col].dropna().astype(str).unique()))
+                self.category_maps[col] = {cat: i for i, cat in enumerate(categories)}
+                categories_[col] = categories
+            elif col not in categories_:
+                # Artifacts fitted before the category index existed only
+                # carry the mapping; rebuild the index in code order.
+                categories_[col] = pd.Index(
+                    sorted(self.category_maps[col], key=self.category_maps[col].get)
+                )
+            df[col] = pd.Categorical(
+                df[col].astype(str), categories=categories_[col]
+            ).codes.astype(np.int32)
+        return df
+
+    def _build_plan(self, columns):
+        """Compile the feature chain into Polars expression stages for a
+        fixed column set.
+
+        The column-presence checks are evaluated once here, against the
+        training schema, instead of on every ``engineer_all_features`` call.
+        """
+        columns = set(columns)
+        stage_time, stage_main = [], []
+        drop = []
+        if {"Transaction_Date", "Transaction_Time"} <= columns:
+            stage_time.append(
+                pl.concat_str(
+                    [pl.col("Transaction_Date").cast(pl.Utf8), pl.col("Transaction_Time").cast(pl.Utf8)],
+                    separator=" ",
+                )
+                .str.strptime(pl.Datetime, strict=False)
+                .alias("_parsed_ts")
+            )
+            stage_main += [
+                pl.col("_parsed_ts").dt.hour().alias("Hour"),
+                (pl.col("_parsed_ts").dt.weekday() - 1).alias("Day_of_Week"),
+                (pl.col("_parsed_ts").dt.weekday() >= 6).cast(pl.Int64).alias("Is_Weekend"),
+                (
+                    (pl.col("_parsed_ts").dt.hour() >= NIGHT_HOUR_START)
+                    | (pl.col("_parsed_ts").dt.hour() <= NIGHT_HOUR_END)
+                )
+                .cast(pl.Int64)
+                .alias("Is_Night"),
+            ]
+            drop += ["Transaction_Date", "Transaction_Time", "_parsed_ts"]
+        if "Transaction_Amount" in columns:
+            amt = pl.col("Transaction_Amount")
+            stage_main += [
+                amt.log1p().alias("Log_Amount"),
+                (amt > HIGH_AMOUNT_THRESHOLD).cast(pl.Int64).alias("High_Amount"),
+                ((amt - self.amount_mean) / self.amount_std).alias("Amount_Zscore"),
+            ]
+        if "Transaction_Velocity" in columns:
+            stage_main.append(
+                (pl.col("Transaction_Velocity") > HIGH_VELOCITY_THRESHOLD)
+                .cast(pl.Int64)
+                .alias("High_Velocity")
+            )
+        if "Distance_From_Home_km" in columns:
+            stage_main.append(
+                (pl.col("Distance_From_Home_km") > LONG_DISTANCE_THRESHOLD_KM)
+                .cast(pl.Int64)
+                .alias("Long_Distance")
+            )
+        if "Time_Since_Last_Transaction_min" in columns:
+            gap = pl.col("Time_Since_Last_Transaction_min")
+            stage_main.append(
+                ((gap > 5).cast(pl.Int64) + (gap > 30) + (gap > 60) + (gap > 1440))
+                .cast(pl.Int8)
+                .alias("Time_Gap_Category")
+            )
+        if {"Transaction_Amount", "Distance_From_Home_km"} <= columns:
+            stage_main.append(
+                (pl.col("Transaction_Amount") * pl.col("Distance_From_Home_km")).alias(
+                    "Amount_x_Distance"
+                )
+            )
+        if {"Transaction_Velocity", "Transaction_Amount"} <= columns:
+            stage_main.append(
+                (pl.col("Transaction_Velocity") * pl.col("Transaction_Amount")).alias(
+                    "Velocity_x_Amount"
+                )
+            )
+        if "Time_Since_Last_Transaction_min" in columns:
+            stage_main.append(
+                (pl.col("Time_Since_Last_Transaction_min") < RAPID_SUCCESSION_MINUTES)
+                .cast(pl.Int64)
+                .alias("Rapid_Succession")
+            )
+        if "Previous_Auth_Failure" in columns:
+            stage_main.append(pl.col("Previous_Auth_Failure").cast(pl.Int64).alias("Auth_Risk"))
+        if "Card_Present" in columns:
+            stage_main.append((1 - pl.col("Card_Present").cast(pl.Int64)).alias("Card_Not_Present"))
+        for col in CATEGORICAL_COLUMNS:
+            if col in columns and col in self.category_maps:
+                stage_main.append(
+                    pl.col(col)
+                    .cast(pl.Utf8)
+                    .replace_strict(self.category_maps[col], default=-1, return_dtype=pl.Int64)
+                    .alias(col)
+                )
+        # The schema is recorded without the target: no expression reads
+        # it, training frames just pass it through, and inference frames
+        # arrive without it — both must match the same plan.
+        return {
+            "stages": [stage_time, stage_main],
+            "drop": drop,
+            "columns": frozenset(columns) - {TARGET_COLUMN},
+        }
+
+    def apply_plan_lazy(self, lazy):
+        """Apply the compiled expression stages to a Polars ``LazyFrame``."""
+        for exprs in self._compiled_plan["stages"]:
+            if exprs:
+                lazy = lazy.with_columns(exprs)
+        if self._compiled_plan["drop"]:
+            lazy = lazy.drop(self._compiled_plan["drop"], strict=False)
+        return lazy
+
+    def _apply_plan(self, df):
+        """Run the compiled Polars plan against a pandas frame."""
+        return self.apply_plan_lazy(pl.from_pandas(df).lazy()).collect().to_pandas()
+
+    def fit_from_lazy(self, lazy):
+        """Learn statistics and category maps from a ``LazyFrame`` and
+        compile the expression plan, without materialising the dataset."""
+        columns = lazy.collect_schema().names()
+        if "Transaction_Amount" in columns:
+            stats = lazy.select(
+                pl.col("Transaction_Amount").mean().alias("mean"),
+                pl.col("Transaction_Amount").std().alias("std"),
+            ).collect()
+            self.amount_mean = float(stats["mean"][0])
+            self.amount_std = float(stats["std"][0]) or 1.0
+        for col in CATEGORICAL_COLUMNS:
+            if col in columns:
+                cats = (
+                    lazy.select(pl.col(col).cast(pl.Utf8).drop_nulls().unique().sort())
+                    .collect()[col]
+                    .to_list()
+                )
+                self.category_maps[col] = {cat: i for i, cat in enumerate(cats)}
+        self._compiled_plan = self._build_plan(columns)
+        self.fitted = True
+        return self
+
+    def compile_single_row_fn(self, feature_names, reuse_buffer=False):
+        """Specialize the engineering chain for one fixed-schema row.
+
+        The general pipeline pays DataFrame construction, dtype inference
+        and per-step dispatch even for a single form/API transaction.
+        This binds the fitted statistics and category maps into a closure
+        that computes every engineered value as scalar arithmetic straight
+        into a float32 vector ordered by ``feature_names``.
+
+        The closure returns ``(values, vec)`` — the engineered values by
+        name (the rule engine wants ``Hour``/``Is_Weekend`` etc.) and the
+        model-ready vector. With ``reuse_buffer`` the vector is one
+        preallocated buffer shared across calls; only enable that when a
+        single thread consumes each result before the next call.
+
+        Returns ``None`` until the engineer is fitted.
+        """
+        if not self.fitted or not feature_names:
+            return None
+        amount_mean = self.amount_mean or 0.0
+        amount_std = self.amount_std or 1.0
+        cat_maps = {col: dict(mapping) for col, mapping in self.category_maps.items()}
+        names = tuple(feature_names)
+        shared_buf = np.empty(len(names), dtype=np.float32) if reuse_buffer else None
+
+        def featurize(tx):
+            amount = tx["Transaction_Amount"]
+            velocity = tx["Transaction_Velocity"]
+            distance = tx["Distance_From_Home_km"]
+            gap = tx["Time_Since_Last_Transaction_min"]
+            auth = int(tx.get("Previous_Auth_Failure", 0))
+            card_present = int(tx.get("Card_Present", 1))
+            ts = tx.get("Transaction_Timestamp")
+            if ts is not None:
+                # Native timestamps skip the format/parse round-trip.
+                hour = ts.hour
+                dow = ts.weekday()
+            else:
+                hour = int(str(tx["Transaction_Time"]).split(":", 1)[0])
+                dow = date.fromisoformat(str(tx["Transaction_Date"])).weekday()
+            values = {
+                "Transaction_Amount": amount,
+                "Transaction_Velocity": velocity,
+                "Distance_From_Home_km": distance,
+                "Time_Since_Last_Transaction_min": gap,
+                "Account_Age_Days": tx.get("Account_Age_Days", 0),
+                "Previous_Auth_Failure": auth,
+                "Card_Present": card_present,
+                "Hour": hour,
+                "Day_of_Week": dow,
+                "Is_Weekend": int(dow >= 5),
+                "Is_Night": int(hour >= NIGHT_HOUR_START or hour <= NIGHT_HOUR_END),
+                "Log_Amount": np.log1p(amount),
+                "High_Amount": int(amount > HIGH_AMOUNT_THRESHOLD),
+                "Amount_Zscore": (amount - amount_mean) / amount_std,
+                "High_Velocity": int(velocity > HIGH_VELOCITY_THRESHOLD),
+                "Long_Distance": int(distance > LONG_DISTANCE_THRESHOLD_KM),
+                "Time_Gap_Category": int(np.searchsorted(_GAP_EDGES, gap, side="left")),
+                "Amount_x_Distance": amount * distance,
+                "Velocity_x_Amount": velocity * amount,
+                "Rapid_Succession": int(gap < RAPID_SUCCESSION_MINUTES),
+                "Auth_Risk": auth,
+                "Card_Not_Present": 1 - card_present,
+            }
+            for col, mapping in cat_maps.items():
+                values[col] = mapping.get(tx.get(col), -1)
+            buf = shared_buf if reuse_buffer else np.empty(len(names), dtype=np.float32)
+            for i, name in enumerate(names):
+                buf[i] = values[name]
+            return values, buf
+
+        return featurize
+
+    def engineer_all_features(self, df, fit=False):
+        """Run the full feature-engineering chain.
+
+        Args:
+            df: raw (or partially engineered) transactions.
+            fit: when True, learn statistics and category maps from ``df``.
+        """
+        # The plan's column checks were baked in against the training
+        # schema, so it only applies to frames with exactly that schema
+        # (the target, when present, passes through untouched); anything
+        # else (timestamp-bearing form rows, partial uploads) takes the
+        # pandas chain, which probes columns per step.
+        if (
+            not fit
+            and pl is not None
+            and self._compiled_plan is not None
+            and frozenset(df.columns) - {TARGET_COLUMN} == self._compiled_plan["columns"]
+        ):
+            return self._apply_plan(df)
+        raw_columns = tuple(df.columns)
+        df = df.copy()
+        # The three producers only read raw input columns, so they can run
+        # concurrently; numpy releases the GIL inside its kernels.
+        time_cols, interaction_cols, risk_cols = Parallel(n_jobs=-1, backend="threading")(
+            delayed(fn)(df)
+            for fn in (self._time_columns, self._interaction_columns, self._risk_columns)
+        )
+        df = df.assign(**time_cols)
+        df = self.create_amount_features(df)
+        df = self.create_aggregated_features(df, fit=fit)
+        df = df.assign(**interaction_cols, **risk_cols)
+        df = self.encode_categoricals(df, fit=fit)
+        df = df.drop(
+            columns=["Transaction_Date", "Transaction_Time", "Transaction_Timestamp"],
+            errors="ignore",
+        )
+        if fit:
+            self.fitted = True
+            if pl is not None:
+                self._compiled_plan = self._build_plan(raw_columns)
+        return df
+
+
+class DataPreprocessor:
+    """Splits engineered data and persists the train/val/test artifacts."""
+
+    def __init__(self):
+        self.loader = TransactionDataLoader()
+        self.engineer = FeatureEngineer()
+
+    def split_data(self, df):
+        """Stratified train/validation/test split on the fraud label."""
+        train_val, test = train_test_split(
+            df,
+            test_size=TEST_SIZE,
+            stratify=df[TARGET_COLUMN],
+            random_state=RANDOM_SEED,
+        )
+        val_fraction = VAL_SIZE / (1.0 - TEST_SIZE)
+        train, val = train_test_split(
+            train_val,
+            test_size=val_fraction,
+            stratify=train_val[TARGET_COLUMN],
+            random_state=RANDOM_SEED,
+        )
+        return train, val, test
+
+    @staticmethod
+    def _write_chunked(df, path, chunk_rows=SAVE_CHUNK_ROWS):
+        """Stream ``df`` to ``path`` as CSV in fixed-size row chunks.
+
+        Uses pyarrow's streaming CSV writer so peak memory stays bounded by
+        one chunk instead of a full extra copy of the split.
+        """
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        n = len(df)
+        with pacsv.CSVWriter(str(path), schema) as writer:
+            for start in range(0, n, chunk_rows):
+                chunk = df.iloc[start:start + chunk_rows]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+    def _save_artifacts(self, train, val, test):
+        """Write the three splits to ``PROCESSED_DATA_DIR`` without
+        materialising any additional full-size frames."""
+        PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        for df, path in ((train, TRAIN_DATA_FILE), (val, VAL_DATA_FILE), (test, TEST_DATA_FILE)):
+            self._write_chunked(df, path)
+            logger.info("Wrote %d rows to %s", len(df), path)
+
+    def split_lazy(self, lazy):
+        """Partition a ``LazyFrame`` into disjoint train/val/test splits by
+        a seeded hash of each row's contents.
+
+        Slicing a lazily shuffled frame is not safe here: the plan is
+        re-executed per collect/sink, and the scan's ``unique`` step makes
+        row order nondeterministic between executions, so index-based
+        slices can overlap and drop rows. Hashing the full row struct
+        instead gives every row a deterministic draw in [0, 1); the three
+        hash ranges partition that interval, so the splits are disjoint
+        and exhaustive by construction however often the plan re-executes,
+        with the fraud rate of each split preserved in expectation.
+        """
+        draw = pl.struct(pl.all()).hash(seed=RANDOM_SEED) / 2.0**64
+        val_lo = 1.0 - TEST_SIZE - VAL_SIZE
+        test_lo = 1.0 - TEST_SIZE
+        return (
+            lazy.filter(draw < val_lo),
+            lazy.filter((draw >= val_lo) & (draw < test_lo)),
+            lazy.filter(draw >= test_lo),
+        )
+
+    def _run_polars(self, streaming=False):
+        """Polars end-to-end pipeline: scan, fit, engineer, split, persist.
+
+        pandas only appears at the return boundary; every intermediate stage
+        is an Arrow-backed ``LazyFrame``, so columns are never copied between
+        stages and expressions fuse across them.
+
+        With ``streaming=True`` each split is sunk straight to Parquet by the
+        streaming engine, which processes the scan in batches smaller than
+        RAM, so the dataset never needs to be resident; the parquet paths are
+        returned instead of materialised frames. Each sink re-executes the
+        scan, which is safe because the split predicates hash row contents —
+        a row lands in the same split on every execution.
+        """
+        lazy = self.loader.scan()
+        self.engineer.fit_from_lazy(lazy)
+        engineered = self.engineer.apply_plan_lazy(lazy)
+        PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        if streaming:
+            n_rows = engineered.select(pl.len()).collect().item()
+            parquet_paths = (TRAIN_DATA_PARQUET, VAL_DATA_PARQUET, TEST_DATA_PARQUET)
+            for lazy_split, path in zip(self.split_lazy(engineered), parquet_paths):
+                lazy_split.sink_parquet(str(path), row_group_size=SAVE_CHUNK_ROWS)
+                logger.info("Sunk split to %s", path)
+            # Parquet row counts come from file metadata, so this check
+            # reads a few footers rather than re-scanning the data.
+            written = sum(
+                pl.scan_parquet(str(path)).select(pl.len()).collect().item()
+                for path in parquet_paths
+            )
+            if written != n_rows:
+                raise ValueError("train/val/test splits must partition the dataset")
+            return parquet_paths
+        # Materialise the engineered frame once; the split filters then run
+        # against the in-memory copy instead of re-executing the scan.
+        df = engineered.collect()
+        frames = []
+        for lazy_split, path in zip(
+            self.split_lazy(df.lazy()), (TRAIN_DATA_FILE, VAL_DATA_FILE, TEST_DATA_FILE)
+        ):
+            split_df = lazy_split.collect()
+            split_df.write_csv(str(path))
+            logger.info("Wrote %d rows to %s", len(split_df), path)
+            frames.append(split_df.to_pandas())
+        if sum(len(frame) for frame in frames) != len(df):
+            raise ValueError("train/val/test splits must partition the dataset")
+        return tuple(frames)
+
+    def _save_engineer(self):
+        """Persist the fitted engineer so the serving processes (API,
+        dashboards) can load the exact training-time feature chain."""
+        MODELS_DIR.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self.engineer, FEATURE_ENGINEER_PATH)
+        logger.info("Saved feature engineer to %s", FEATURE_ENGINEER_PATH)
+
+    def run_preprocessing(self, streaming=False):
+        """End-to-end: load, engineer, split and persist.
+
+        Args:
+            streaming: with polars installed, stream splits to Parquet in
+                bounded memory and return the written paths instead of
+                DataFrames.
+        """
+        if pl is not None and streaming:
+            paths = self._run_polars(streaming=True)
+            self._save_engineer()
+            return paths
+        if pl is not None:
+            train, val, test = self._run_polars()
+        else:
+            df = self.loader.load()
+            df = self.engineer.engineer_all_features(df, fit=True)
+            train, val, test = self.split_data(df)
+            self._save_artifacts(train, val, test)
+        self._save_engineer()
+        logger.info(
+            "Preprocessing complete: train=%d val=%d test=%d", len(train), len(val), len(test)
+        )
+        return train, val, test
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    DataPreprocessor().run_preprocessing()
@@ -0,0 +1,38 @@
+"""Optional text embeddings over transaction metadata.
+
+Used to enrich the numeric feature matrix with sentence embeddings of
+free-text fields (merchant descriptors, locations). Requires the
+``sentence-transformers`` extra.
+"""
+
+import logging
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionEmbedder:
+    """Encodes transaction text into a dense float32 embedding block."""
+
+    def __init__(self, model_name="all-MiniLM-L6-v2"):
+        if SentenceTransformer is None:
+            raise ImportError("sentence-transformers is not installed")
+        self.model = SentenceTransformer(model_name)
+
+    def embed(self, texts, batch_size=256):
+        """Encode ``texts`` into one ``(n, d)`` row-major float32 block.
+
+        Returning a single contiguous ndarray keeps the downstream hstack
+        with the numeric features copy-cheap and cache-friendly for tree
+        training, instead of appending one pandas column per dimension.
+        """
+        embeddings = self.model.encode(
+            list(texts), batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False
+        )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
@@ -0,0 +1,136 @@
+"""Async load tester for the fraud-detection API.
+
+Exercises the live endpoints through ``httpx.AsyncClient`` so requests
+run concurrently: the server's dynamic batcher only shows its gains when
+many ``/detect/fraud`` calls are in flight at once, which a sequential
+``requests`` loop can never produce. Traffic is plain HTTP/1.1 over
+keep-alive connections (uvicorn does not speak HTTP/2), so the client's
+connection-pool size is what actually bounds concurrency — it is raised
+to the concurrent-request count so the pool never caps the measurement.
+
+Run against a started server with ``python test_api.py``.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+from src.config import API_PORT
+
+logger = logging.getLogger(__name__)
+
+# Requests in flight during the concurrency test; the client pool is
+# sized to match so it never caps the measurement.
+CONCURRENT_REQUESTS = 200
+
+SAMPLE_TRANSACTION = {
+    "Transaction_Date": "2024-06-15",
+    "Transaction_Time": "14:30:00",
+    "Transaction_Amount": 2500.0,
+    "Transaction_Velocity": 2,
+    "Distance_From_Home_km": 12.5,
+    "Time_Since_Last_Transaction_min": 95.0,
+    "Account_Age_Days": 730,
+    "Previous_Auth_Failure": 0,
+    "Card_Present": 1,
+    "Card_Type": "Visa",
+    "Currency": "INR",
+    "Transaction_Location": "Mumbai",
+    "Merchant_Category": "Groceries",
+}
+
+SUSPICIOUS_TRANSACTION = {
+    **SAMPLE_TRANSACTION,
+    "Transaction_Time": "02:15:00",
+    "Transaction_Amount": 250_000.0,
+    "Transaction_Velocity": 9,
+    "Distance_From_Home_km": 1200.0,
+    "Time_Since_Last_Transaction_min": 2.0,
+    "Previous_Auth_Failure": 1,
+    "Card_Present": 0,
+}
+
+
+class APITester:
+    """Concurrency-driven smoke and load tests for the API server."""
+
+    def __init__(self, base_url=f"http://localhost:{API_PORT}"):
+        self.base_url = base_url
+
+    async def test_health(self, client):
+        response = await client.get("/health")
+        response.raise_for_status()
+        logger.info("Health: %s", response.json())
+
+    async def test_single_detection(self, client):
+        for payload in (SAMPLE_TRANSACTION, SUSPICIOUS_TRANSACTION):
+            response = await client.post("/detect/fraud", json=payload)
+            response.raise_for_status()
+            result = response.json()
+            logger.info(
+                "Single detection: risk=%.3f level=%s fraud=%s",
+                result["combined_risk_score"],
+                result["risk_level"],
+                result["is_fraud"],
+            )
+
+    async def test_batch_detection(self, client, n=50):
+        payload = {"transactions": [SAMPLE_TRANSACTION] * n}
+        start = time.perf_counter()
+        response = await client.post("/detect/batch", json=payload)
+        elapsed = time.perf_counter() - start
+        response.raise_for_status()
+        stats = response.json()["statistics"]
+        logger.info(
+            "Batch detection: %d rows in %.3fs (%d frauds)",
+            stats["total"],
+            elapsed,
+            stats["fraud_count"],
+        )
+
+    async def test_concurrent(self, client, n=CONCURRENT_REQUESTS):
+        """Fire ``n`` simultaneous single-transaction requests.
+
+        This is the path that actually fills the server-side micro-batches;
+        the reported throughput should comfortably beat n x the sequential
+        single-request latency.
+        """
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *[client.post("/detect/fraud", json=SAMPLE_TRANSACTION) for _ in range(n)]
+        )
+        elapsed = time.perf_counter() - start
+        errors = sum(1 for r in responses if r.status_code != 200)
+        logger.info(
+            "Concurrent: %d requests in %.3fs (%.1f req/s, %d errors)",
+            n,
+            elapsed,
+            n / elapsed,
+            errors,
+        )
+
+    async def test_metrics(self, client):
+        response = await client.get("/metrics")
+        response.raise_for_status()
+        logger.info("Metrics: %s", response.json())
+
+    async def run_all_tests(self):
+        # Without the raised limit httpx's default pool (100 connections)
+        # would serialize half the concurrency test's requests.
+        limits = httpx.Limits(max_connections=CONCURRENT_REQUESTS)
+        async with httpx.AsyncClient(
+            base_url=self.base_url, limits=limits, timeout=30.0
+        ) as client:
+            await self.test_health(client)
+            await self.test_single_detection(client)
+            await self.test_batch_detection(client)
+            await self.test_concurrent(client)
+            await self.test_metrics(client)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    tester = APITester()
+    asyncio.run(tester.run_all_tests())